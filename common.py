@@ -11,15 +11,53 @@ Common tools for any algorithmic trading project.
 
 import sys
 import re
-import math
 import logging
 import select
+import multiprocessing
 from logging.handlers import TimedRotatingFileHandler
 from os import path
 import os
+import shutil
+import subprocess
 import datetime
+import calendar
 from datetime import timedelta
 from itertools import chain, combinations
+from functools import partial
+from collections import Counter
+
+from tools.loggers import ensure_path_existence
+
+# English to spanish month abbreviations used by date_in_spanish.
+_MONTH_TRANS = {
+    'Jan': 'Ene',
+    'Feb': 'Feb',
+    'Mar': 'Mar',
+    'Apr': 'Abr',
+    'May': 'May',
+    'Jun': 'Jun',
+    'Jul': 'Jul',
+    'Aug': 'Ago',
+    'Sep': 'Sep',
+    'Oct': 'Oct',
+    'Nov': 'Nov',
+    'Dec': 'Dic'
+}
+_MONTH_RE = re.compile('|'.join(map(re.escape, _MONTH_TRANS)))
+
+# Translation table that deletes decimal digits. Used by ib_option_name.
+_STRIP_DIGITS = str.maketrans('', '', '0123456789')
+
+# Upper case english month abbreviations used in Interactive Brokers names.
+_MONTHS_EN = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP',
+              'OCT', 'NOV', 'DEC')
+
+# Standard equity option convention code: symbol, YYMMDD expiration, right and
+# strike times 1000 in eight digits.
+_OCC_RE = re.compile(r'([A-Z]+)(\d{6})([CP])(\d{8})')
+
+# Path of the sox 'play' command used by play_beep (None if not installed).
+_PLAY = shutil.which('play')
 
 
 def powerset(iterable):
@@ -37,14 +75,54 @@ def powerset(iterable):
     powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)
     """
     s = list(iterable)
-    return chain.from_iterable(combinations(s, r) for r in range(len(s) + 1))
+    return chain.from_iterable(
+        map(partial(combinations, s), range(len(s) + 1)))
+
+
+def unique_powerset(iterable):
+    """
+    Computes the power set of one iterable that may contain repeated
+    elements (a multiset). Unlike powerset, every sub-multiset is generated
+    only once, so there is no need to remove duplicates afterwards.
+
+    Parameters
+    ----------
+    iterable : iterable
+        Representation of some multiset. Its elements must be hashable.
+
+    Returns
+    -------
+        Iterable power set without repetitions
+    unique_powerset([1,1,2]) --> () (1,) (1,1) (2,) (1,2) (1,1,2)
+
+    Examples
+    --------
+    >>> sorted(unique_powerset([1, 1, 2]))
+    [(), (1,), (1, 1), (1, 1, 2), (1, 2), (2,)]
+    >>> len(list(unique_powerset('aabbbc')))
+    24
+    """
+    counts = list(Counter(iterable).items())
+
+    def generate(index):
+        if index == len(counts):
+            yield ()
+            return
+        value, multiplicity = counts[index]
+        for tail in generate(index + 1):
+            for copies in range(multiplicity + 1):
+                yield (value,) * copies + tail
+
+    return generate(0)
 
 
 def assign_tasks(tasks, processor, processors):
     """
     Given a list of tasks this method returns the sub-list of tasks that should
     be performed by processor number 'processor'. The total number of
-    processors is 'processors'. The assignation is fair.
+    processors is 'processors'. The assignation is fair: every processor gets
+    a contiguous block of either floor(n/processors) or ceil(n/processors)
+    tasks.
 
     Parameters
     ----------
@@ -58,13 +136,56 @@ def assign_tasks(tasks, processor, processors):
     Returns
     -------
         The sub-lists of tasks for 'processor''.
-    """
-    tasks_for_processor = math.ceil(len(tasks) / processors)
-    start = tasks_for_processor * processor
-    end = start + tasks_for_processor
+
+    Examples
+    --------
+    >>> [len(assign_tasks(list(range(10)), p, 4)) for p in range(4)]
+    [3, 3, 2, 2]
+    >>> assign_tasks(list(range(10)), 2, 4)
+    [6, 7]
+    """
+    # The first len(tasks) % processors processors get one extra task, so
+    # loads differ by at most one.
+    quotient, remainder = divmod(len(tasks), processors)
+    start = quotient * processor + min(processor, remainder)
+    end = start + quotient + (1 if processor < remainder else 0)
     return tasks[start:end]
 
 
+def assign_tasks_cyclic(tasks, processor, processors):
+    """
+    Cyclic (round-robin) alternative to assign_tasks. Processor number
+    'processor' gets the tasks in positions processor,
+    processor + processors, processor + 2 * processors, and so on.
+
+    assign_tasks gives every processor a contiguous block, so expensive tasks
+    that lie next to each other in 'tasks' (i.e. heavy symbols sorted
+    alphabetically) end up in the same processor. The cyclic assignation
+    spreads them among all processors, which is better when the task cost is
+    heterogeneous. Both assignations give every processor the same number of
+    tasks up to one.
+
+    Parameters
+    ----------
+    tasks : list
+        Tasks to be performed
+    processor : int
+        Number of processor.
+    processors : int
+        Total number of processors
+
+    Returns
+    -------
+        The sub-lists of tasks for 'processor''.
+
+    Examples
+    --------
+    >>> assign_tasks_cyclic(list(range(10)), 1, 4)
+    [1, 5, 9]
+    """
+    return tasks[processor::processors]
+
+
 class Dates:
     """
     Dates iterator. You define an initial and final base_date, and it iterates
@@ -82,6 +203,14 @@ class Dates:
             End base_date.
         """
         self.step = step
+        # Constant steps used by __next__.
+        self._step_td = timedelta(days=step)
+        self._week_back = timedelta(days=-7)
+        self._week_fwd = timedelta(days=7)
+        self._minus4 = timedelta(days=-4)
+        self._plus4 = timedelta(days=4)
+        self._window_180_back = timedelta(days=-180)
+        self._window_180_fwd = timedelta(days=180)
         if initial_date and end_date:
             assert initial_date <= end_date, \
                 'The starting base_date must be lower or equal than the '
@@ -107,28 +236,24 @@ class Dates:
         if self.initial_date and self.end_date:
             if self.date > self.end_date:
                 raise StopIteration
-            self.date += timedelta(days=self.step)
+            self.date += self._step_td
             return aux.replace(hour=0, minute=0, second=0, microsecond=0)
         if self.initial_date is None:
             # TODO: I don't understand why constants like -180, -7 or 4
             # are used.
-            if self.date <= self.end_date + timedelta(days=-180):
+            if self.date <= self.end_date + self._window_180_back:
                 raise StopIteration
-            self.date += timedelta(days=-7)
-            return [
-                aux.replace(hour=0, minute=0, second=0, microsecond=0) +
-                timedelta(days=-4),
-                aux.replace(hour=0, minute=0, second=0, microsecond=0)
-            ]
+            self.date += self._week_back
+            aux_midnight = aux.replace(hour=0, minute=0, second=0,
+                                       microsecond=0)
+            return [aux_midnight + self._minus4, aux_midnight]
         if self.end_date is None:
-            if self.date >= self.initial_date + timedelta(days=180):
+            if self.date >= self.initial_date + self._window_180_fwd:
                 raise StopIteration
-            self.date += timedelta(days=7)
-            return [
-                aux.replace(hour=0, minute=0, second=0, microsecond=0),
-                aux.replace(hour=0, minute=0, second=0, microsecond=0) +
-                timedelta(days=4)
-            ]
+            self.date += self._week_fwd
+            aux_midnight = aux.replace(hour=0, minute=0, second=0,
+                                       microsecond=0)
+            return [aux_midnight, aux_midnight + self._plus4]
 
 
 def date_in_spanish(date):
@@ -150,35 +275,24 @@ def date_in_spanish(date):
     Examples
     --------
     >>> date_in_spanish("23-Apr-2021")
-    23-Abr-2021 
+    '23-Abr-2021'
     >>> date_in_spanish("Dec-24-2020")
-    Dic-24-2020
-    """
-    month_trans = {
-        'Jan': 'Ene',
-        'Feb': 'Feb',
-        'Mar': 'Mar',
-        'Apr': 'Abr',
-        'May': 'May',
-        'Jun': 'Jun',
-        'Jul': 'Jul',
-        'Aug': 'Ago',
-        'Sep': 'Sep',
-        'Oct': 'Oct',
-        'Nov': 'Nov',
-        'Dec': 'Dic'
-    }
-    for month in month_trans:
-        date = re.sub(month, month_trans[month], date)
-    return date
+    'Dic-24-2020'
+    """
+    return _MONTH_RE.sub(lambda match: _MONTH_TRANS[match.group(0)], date)
 
 
 def play_beep():
     """ Plays an alert sound.
         It is used when a fatal error condition is found, o when the connection
         to TWS is broken and the program is restarted.
+        The sound is played in background, so the caller is not blocked. If
+        sox 'play' is not installed nothing is done.
     """
-    os.system('play -nq -t alsa synth 1 sine 180')
+    if _PLAY is None:
+        return
+    subprocess.Popen([_PLAY, '-nq', '-t', 'alsa', 'synth', '1', 'sine', '180'],
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
 def check_date_validity(date):
@@ -190,9 +304,8 @@ def check_date_validity(date):
     date : str
         Date in string format: "YYYY-MM-DD'
     """
-    year, month, day = date.split("-")
     try:
-        datetime.datetime(int(year), int(month), int(day))
+        datetime.datetime.strptime(date, "%Y-%m-%d")
     except ValueError:
         return False
     return True
@@ -201,27 +314,30 @@ def check_date_validity(date):
 def monday_and_friday(date):
     """
     Returns the monday and friday dates of the week containing base_date.
-    
+    Sundays are considered part of the next week.
+
     Parameters
     ----------
     date : datetime.pyi
 
     Examples
     --------
-    >>> str(monday_and_friday(datetime.datetime(2021, 11, 28)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 11, 29)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 11, 30)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 12, 1)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 12, 2)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 12, 3)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
-    >>> str(monday_and_friday(datetime.datetime(2021, 12, 4)))
-    '(datetime.datetime(2021, 11, 29), datetime.datetime(2021, 12, 3, 0, 0))'
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 11, 28))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 11, 29))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 11, 30))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 12, 1))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 12, 2))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 12, 3))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 12, 4))]
+    ['2021-11-29 00:00:00', '2021-12-03 00:00:00']
+    >>> [str(d) for d in monday_and_friday(datetime.datetime(2021, 12, 1, 10))]
+    ['2021-11-29 10:00:00', '2021-12-03 10:00:00']
 
     Returns
     -------
@@ -229,10 +345,10 @@ def monday_and_friday(date):
          The required monday and friday dates.
     """
     day_of_week = date.weekday()
-    if day_of_week == 6:
-        day_of_week = -1
-    monday = date - datetime.timedelta(days=day_of_week)
-    friday = date + datetime.timedelta(days=4 - day_of_week)
+    # Sundays belong to the next week.
+    monday_offset = -day_of_week if day_of_week != 6 else 1
+    monday = date + datetime.timedelta(days=monday_offset)
+    friday = date + datetime.timedelta(days=monday_offset + 4)
     return monday, friday
 
 
@@ -300,19 +416,14 @@ def first_day_in_period(period, date):
             return date + datetime.timedelta(days=-4)
         else:
             return None
-    next_day = date
-    while True:
-        next_day += datetime.timedelta(days=1)
-        if next_day.day > date.day and next_day.weekday() < 5:
-            return None
-        if next_day.day <= date.day:
-            first_day = date
-            first_day = first_day.replace(day=1)
-            if first_day.weekday() < 5:
-                return first_day
-            if first_day.weekday() == 5:
-                return first_day + datetime.timedelta(days=2)
-            return first_day + datetime.timedelta(days=1)
+    first_weekday, last_day = calendar.monthrange(date.year, date.month)
+    last_weekday = (first_weekday + last_day - 1) % 7
+    if date.day != last_day - max(0, last_weekday - 4):
+        return None
+    first_day = date.replace(day=1)
+    if first_day.weekday() < 5:
+        return first_day
+    return first_day + datetime.timedelta(days=7 - first_day.weekday())
 
 
 def next_date(last_date, periodicity, day, time_):
@@ -387,9 +498,7 @@ def next_date(last_date, periodicity, day, time_):
             else:
                 month = 1
                 year += 1
-            while not check_date_validity(
-                    str(year) + '-' + str(month) + '-' + str(day)):
-                day -= 1
+            day = min(day, calendar.monthrange(year, month)[1])
             result = result.replace(year=year, month=month, day=day)
         elif day >= 28 and result.day <= 4:
             while result.day <= 4:
@@ -476,7 +585,9 @@ def input_with_timeout(message, auto_response, timeout=60):
 def incrementing_filename(base, ext):
     """
     Returns the string base+{cons}+'.'+extension of the next available filane in
-    the file system where 'cons' is the lowest possible integer.
+    the file system where 'cons' is the lowest possible integer. The files
+    are assumed to be numbered consecutively from 1 (as this method does), so
+    only O(log n) file system checks are needed.
     Parameters
     ----------
     base : str
@@ -494,13 +605,21 @@ def incrementing_filename(base, ext):
     >>> incrementing_filename('./pickle/20210104-20210212', 'pck')
     './pickle/20210104-20210212-1.pck'
     """
-    ind = 1
-    while True:
-        file_name = base + '-' + str(ind) + '.' + ext
-        if not os.path.exists(file_name):
-            break
-        ind += 1
-    return file_name
+    def exists(ind):
+        return os.path.exists(base + '-' + str(ind) + '.' + ext)
+
+    # Exponential search of a missing index followed by a binary search
+    # between the last existing index (low) and the missing one (high).
+    low, high = 0, 1
+    while exists(high):
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if exists(middle):
+            low = middle
+        else:
+            high = middle
+    return base + '-' + str(high) + '.' + ext
 
 
 class PendingWork:
@@ -522,6 +641,7 @@ class PendingWork:
         """
         ensure_path_existence("./pending_work/")
         self._file_name = file_name
+        self._full_path = './pending_work/' + file_name
 
     def write(self, data):
         """
@@ -530,7 +650,7 @@ class PendingWork:
             Recovery data
         :return: None
         """
-        with open('./pending_work/' + self._file_name, 'w') as f_out:
+        with open(self._full_path, 'w') as f_out:
             f_out.write(data)
 
     def read(self):
@@ -539,29 +659,58 @@ class PendingWork:
 
         RETURNS
         -------
-        None if the file does not exist, otherwise the recovery data.
+        None if the file does not exist or is empty, otherwise the recovery
+        data.
         """
-        if not path.exists('./pending_work/' + self._file_name):
+        if not path.exists(self._full_path):
             return None
-        with open('./pending_work/' + self._file_name, 'r') as f_open:
-            data = f_open.readline()
-            if data != '' and data[-1] == '\n':
-                data = data[:len(data) - 1]
-        return data
+        with open(self._full_path, 'r') as f_open:
+            return f_open.read().rstrip('\n') or None
+
+    def append(self, data):
+        """
+        Appends one line of recovery data. It is used when several elements
+        are completed in any order (i.e. in parallel) and all of them must be
+        remembered, not only the last one.
+        :param data: str
+            Recovery data
+        :return: None
+        """
+        with open(self._full_path, 'a') as f_out:
+            f_out.write(data + '\n')
+
+    def read_lines(self):
+        """
+        Reads the recovery data stored with append.
+
+        RETURNS
+        -------
+        The set of stored lines. It is empty if the file does not exist.
+        """
+        if not path.exists(self._full_path):
+            return set()
+        with open(self._full_path, 'r') as f_open:
+            return set(f_open.read().splitlines())
+
+    def exists(self):
+        """
+        Returns True if the file associated to the class instance exists.
+        """
+        return path.exists(self._full_path)
 
     def clear(self):
         """
         Deletes the file associated to the class instance.
         :return: None
         """
-        if path.exists('./pending_work/' + self._file_name):
-            os.system('rm ' + './pending_work/' + self._file_name)
+        if path.exists(self._full_path):
+            os.remove(self._full_path)
         else:
-            raise FileExistsError("File " + './pending_work/' +
-                                  self._file_name + " does not exist.")
+            raise FileExistsError("File " + self._full_path +
+                                  " does not exist.")
 
 
-def persistent_generate(elements, name):
+def persistent_generate(elements, name, cost_key=None):
     """
     This generator is used to download time series but the program is prone to
     crash, and it is a waste of time to start from the beginning. To allow
@@ -575,23 +724,91 @@ def persistent_generate(elements, name):
         File name of the PendingWork instance.
         Carefully avoid the use of the name of other PendingWork instance with
         the same name.
-    """
+    cost_key : callable
+        If given, elements are generated in descending order of
+        cost_key(element), so the most expensive ones start first (Longest
+        Processing Time first). It pays off when the elements feed a dynamic
+        dispatcher and the cost of each one is above half a second or so.
+        The order must be the same between runs to allow recovery.
+    """
+    if cost_key is not None:
+        elements = sorted(elements, key=cost_key, reverse=True)
     pending_work = PendingWork(name)
     initial_element = pending_work.read()
     for ind, element in enumerate(elements):
-        if initial_element is not None and \
-           not isinstance(initial_element, datetime.date) and \
-           isinstance(element, datetime.date):
-            initial_element = datetime.datetime.strptime(
-                initial_element, "%Y-%m-%d %H:%M:%S")
-        if initial_element is not None and initial_element != element:
-            continue
-        initial_element = None
+        if initial_element is not None:
+            # The recovery data is a string; dates are parsed only once.
+            if isinstance(initial_element, str) and \
+                    isinstance(element, datetime.date):
+                initial_element = datetime.datetime.strptime(
+                    initial_element, "%Y-%m-%d %H:%M:%S")
+            if initial_element != element:
+                continue
+            initial_element = None
         pending_work.write(str(element))
         yield ind, element
     pending_work.clear()
 
 
+def _apply_worker(job):
+    """
+    Applies worker_fn to task and returns both the task and the result. It is
+    defined at module level to be picklable by multiprocessing.
+    """
+    worker_fn, task = job
+    return task, worker_fn(task)
+
+
+def dispatch_tasks(tasks, worker_fn, n_workers, name=None):
+    """
+    Runs worker_fn on every task using a pool of n_workers processes. Unlike
+    assign_tasks, tasks are not partitioned in advance: every idle worker
+    takes the next pending task, so a slow task (i.e. a rate limited
+    download) does not leave a whole partition waiting behind it.
+
+    PARAMETERS
+    ----------
+    tasks : list
+        Tasks to be performed.
+    worker_fn : callable
+        Function applied to every task. It must be picklable (defined at
+        module level).
+    n_workers : int
+        Number of worker processes.
+    name : str
+        If given, the str of every completed task is appended to a
+        PendingWork instance with this name. When the program crashes and is
+        run again, the completed tasks are skipped. The file is deleted when
+        all tasks finish.
+
+    Yields
+    ------
+        (task, result) pairs in completion order.
+    """
+    pending_work = PendingWork(name) if name is not None else None
+    if pending_work is not None:
+        completed = pending_work.read_lines()
+        tasks = [task for task in tasks if str(task) not in completed]
+    with multiprocessing.Pool(n_workers) as pool:
+        for task, result in pool.imap_unordered(
+                _apply_worker, [(worker_fn, task) for task in tasks],
+                chunksize=1):
+            if pending_work is not None:
+                pending_work.append(str(task))
+            yield task, result
+    if pending_work is not None and pending_work.exists():
+        pending_work.clear()
+
+
+def _ib_expire_str(expire):
+    """
+    Formats an expiration base_date as DDMMMYY with english month
+    abbreviations (i.e. '05FEB21') without depending on the locale.
+    """
+    return f"{expire.day:02d}{_MONTHS_EN[expire.month - 1]}" \
+        f"{expire.year % 100:02d}"
+
+
 def ib_option_name(symbol, expire, strike, right):
     """
     Yields a string (using Interactive Brokers style) with the name of the
@@ -624,14 +841,41 @@ def ib_option_name(symbol, expire, strike, right):
     >>> ib_option_name('AAPL',datetime.datetime(2021, 10, 10),150.0,'P')
     'AAPL 10OCT21 150.0 P'
     """
-    expire_str = expire.strftime("%d%b%y").upper().replace('ENE', 'JAN').\
-        replace('ABR', 'APR').replace('AGO', 'AUG').\
-        replace('DIC', 'DEC')
-    symbol = symbol.replace('0', '').replace('1', '').replace('2', '').\
-        replace('3', '').replace('4', '').replace('5', '').replace('6', '').\
-        replace('7', '').replace('8', '').replace('9', '')
-    return symbol + ' ' + expire_str + " " + "{0:.1f}".format(strike) + " " + \
-        right
+    return f"{symbol.translate(_STRIP_DIGITS)} {_ib_expire_str(expire)} " \
+        f"{strike:.1f} {right}"
+
+
+def ib_option_names(symbol, expire, strikes, rights):
+    """
+    Batch version of ib_option_name for several options with the same
+    underlying and expiration base_date (i.e. an option chain). The symbol and
+    the expiration are formatted only once.
+
+    Parameters
+    ----------
+    symbol : str
+        Options underlying.
+    expire : datetime.pyi
+        Expiration base_date.
+    strikes : iterable of float
+        Options strikes.
+    rights : iterable of str
+        Put ('P') or call ('C') for every strike.
+
+    Returns
+    -------
+        list
+        Interactive Brokers style names, one for every (strike, right) pair.
+
+    Examples
+    --------
+    >>> ib_option_names('ALB', datetime.datetime(2021, 2, 5), [150.0, 155.0],
+    ...                 ['C', 'P'])
+    ['ALB 05FEB21 150.0 C', 'ALB 05FEB21 155.0 P']
+    """
+    prefix = f"{symbol.translate(_STRIP_DIGITS)} {_ib_expire_str(expire)} "
+    return [f"{prefix}{strike:.1f} {right}"
+            for strike, right in zip(strikes, rights)]
 
 
 def from_standard_equity_option_convention(code: str) -> dict:
@@ -658,10 +902,10 @@ def from_standard_equity_option_convention(code: str) -> dict:
     {'symbol': 'YHOO', 'expire': '20150416', 'right': 'C', 'strike': 30.0}
     """
     option = dict()
-    parts = re.search('([A-Z]+)([0-9]+)([CP])([0-9]+)', code)
+    parts = _OCC_RE.match(code)
     option['symbol'] = parts.group(1)
     expire = parts.group(2)
     option['expire'] = '20' + expire[0:2] + expire[2:4] + expire[4:6]
     option['right'] = parts.group(3)
-    option['strike'] = float(parts.group(4)) / 1000.0
+    option['strike'] = int(parts.group(4)) / 1000
     return option